@@ -8,6 +8,7 @@ Provides:
 """
 
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
@@ -42,8 +43,8 @@ def validate_file_extension(file_path: str) -> None:
     Raises:
         ValueError: If the file extension is not allowed
     """
-    path = Path(file_path)
-    suffix = path.suffix.lower()
+    # os.path.splitext matches Path.suffix without building a Path object
+    suffix = os.path.splitext(file_path)[1].lower()
     if suffix not in ALLOWED_EXTENSIONS:
         raise ValueError(
             f"Invalid file type: '{suffix}'. "
@@ -52,12 +52,7 @@ def load_sdlxliff(file_path: Path) -> Tuple[etree._ElementTree, etree._Element]:
         raise FileNotFoundError(f"File not found: {file_path}")
 
     # Check file size to prevent memory exhaustion
-    file_size = file_path.stat().st_size
-    if file_size > MAX_FILE_SIZE:
-        raise ValueError(
-            f"File too large: {file_size / (1024*1024):.1f}MB "
-            f"(max: {MAX_FILE_SIZE / (1024*1024):.0f}MB)"
-        )
+    _check_size(file_path.stat().st_size)
 
     parser = create_secure_parser()
     tree = etree.parse(str(file_path), parser)
@@ -66,6 +61,37 @@ def load_sdlxliff(file_path: Path) -> Tuple[etree._ElementTree, etree._Element]:
     return tree, root
 
 
+def parse_sdlxliff_bytes(data: bytes) -> Tuple[etree._ElementTree, etree._Element]:
+    """
+    Parse SDLXLIFF content held in memory with the same security checks.
+
+    Args:
+        data: Raw file content
+
+    Returns:
+        Tuple of (ElementTree, root Element)
+
+    Raises:
+        ValueError: If content exceeds size limit
+    """
+    _check_size(len(data))
+
+    parser = create_secure_parser()
+    root = etree.fromstring(data, parser)
+    tree = root.getroottree()
+
+    return tree, root
+
+
+def _check_size(size: int) -> None:
+    """Raise ValueError if content of the given size exceeds MAX_FILE_SIZE."""
+    if size > MAX_FILE_SIZE:
+        raise ValueError(
+            f"File too large: {size / (1024*1024):.1f}MB "
+            f"(max: {MAX_FILE_SIZE / (1024*1024):.0f}MB)"
+        )
+
+
 def detect_bom(file_path: Path) -> bool:
     """
     Check if a file has a UTF-8 BOM.
@@ -86,7 +112,7 @@ def detect_bom(file_path: Path) -> bool:
 def save_sdlxliff(
     root: etree._Element,
     output_path: Path,
-    original_path: Path,
+    has_bom: bool,
     create_backup: bool = True
 ) -> None:
     """
@@ -97,21 +123,18 @@ def save_sdlxliff(
     a backup of the original file before overwriting.
 
     Preserves:
-    - UTF-8 BOM if present in original
+    - UTF-8 BOM if the loaded content had one
     - XML declaration format
 
     Args:
         root: The root XML element to save
         output_path: Where to save the file
-        original_path: Original file path (for BOM detection)
+        has_bom: Whether to write a UTF-8 BOM (recorded when the content was loaded)
         create_backup: If True and overwriting existing file, create .bak backup
 
     Raises:
         IOError: If file cannot be written
     """
-    # Check if original file had BOM
-    has_bom = detect_bom(original_path)
-
     # Generate XML content
     xml_content = etree.tostring(
         root,
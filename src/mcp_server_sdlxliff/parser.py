@@ -5,6 +5,7 @@ Handles parsing, reading, and writing SDLXLIFF files.
 SDLXLIFF is an extension of XLIFF used by SDL Trados Studio.
 """
 
+import codecs
 import logging
 import re
 from copy import deepcopy
@@ -14,7 +15,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from lxml import etree
 
 from .constants import DEFAULT_NAMESPACES, MAX_FILE_SIZE, MAX_SEGMENT_TEXT_SIZE
-from .io import load_sdlxliff, save_sdlxliff
+from .io import detect_bom, load_sdlxliff, parse_sdlxliff_bytes, save_sdlxliff
 from .tags import (
     build_mrk_with_tags,
     extract_content_with_tags,
@@ -24,20 +25,30 @@ from .tags import (
 
 logger = logging.getLogger("sdlxliff-parser")
 
+# Matches any tag placeholder: {id}, {/id} or {x:id}
+PLACEHOLDER_PATTERN = re.compile(r'\{/?(\d+|x:\d+)\}')
+
 
 class SDLXLIFFParser:
     """Parser for SDLXLIFF files."""
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: Optional[str], data: Optional[bytes] = None):
         """
         Initialize the parser with a file path.
 
         Args:
-            file_path: Path to the SDLXLIFF file
-        """
-        self.file_path = Path(file_path)
+            file_path: Path to the SDLXLIFF file, or None for in-memory
+                       content with no backing file
+            data: Optional file content already in memory. If given, it is
+                  parsed instead of reading file_path.
+        """
+        if file_path is None and data is None:
+            raise ValueError("Either file_path or data must be provided")
+        self.file_path: Optional[Path] = Path(file_path) if file_path is not None else None
         self.tree: Optional[etree._ElementTree] = None
         self.root: Optional[etree._Element] = None
+        # Whether the loaded content started with a UTF-8 BOM (kept on save)
+        self._has_bom = False
         # Instance-level copy to avoid mutating class attribute
         self.namespaces: Dict[str, str] = dict(DEFAULT_NAMESPACES)
         # Storage for original mrk elements (deep copies for tag restoration)
@@ -50,13 +61,36 @@ class SDLXLIFFParser:
         self._sdl_seg_index: Dict[str, etree._Element] = {}
         # Repetition index: maps (tu_id, seg_id) -> count of repetitions
         self._repetition_counts: Dict[Tuple[str, str], int] = {}
-        self._load_file()
+        self._load_file(data)
         self._build_segment_index()
         self._build_repetition_index()
 
-    def _load_file(self):
-        """Load and parse the SDLXLIFF file."""
-        self.tree, self.root = load_sdlxliff(self.file_path)
+    @classmethod
+    def from_bytes(cls, data: bytes, file_path: Optional[str] = None) -> "SDLXLIFFParser":
+        """
+        Create a parser from SDLXLIFF content held in memory.
+
+        Uses the same secure parser settings and size limit as loading from disk.
+        file_path is only used as the default save location; without it, save()
+        requires an explicit output_path.
+
+        Args:
+            data: Raw SDLXLIFF content
+            file_path: Optional path to associate with the content
+
+        Returns:
+            SDLXLIFFParser instance
+        """
+        return cls(file_path, data=data)
+
+    def _load_file(self, data: Optional[bytes] = None):
+        """Load and parse the SDLXLIFF file (or in-memory content, if given)."""
+        if data is None:
+            self.tree, self.root = load_sdlxliff(self.file_path)
+            self._has_bom = detect_bom(self.file_path)
+        else:
+            self.tree, self.root = parse_sdlxliff_bytes(data)
+            self._has_bom = data.startswith(codecs.BOM_UTF8)
         self._update_namespaces()
 
     def _update_namespaces(self):
@@ -552,7 +586,7 @@ class SDLXLIFFParser:
             original_content = source_content if source_content['has_tags'] else extract_content_with_tags(original_mrk)
 
             # Check if the text appears to contain placeholder tags
-            has_placeholders = bool(re.search(r'\{/?(\d+|x:\d+)\}', target_text))
+            has_placeholders = PLACEHOLDER_PATTERN.search(target_text) is not None
 
             if original_content['has_tags']:
                 if has_placeholders:
@@ -630,9 +664,17 @@ class SDLXLIFFParser:
         Args:
             output_path: Optional output path. If None, overwrites the original file.
             create_backup: If True and overwriting existing file, create .bak backup.
+
+        Raises:
+            ValueError: If output_path is None and the parser has no backing file
         """
-        out_path = Path(output_path) if output_path else self.file_path
-        save_sdlxliff(self.root, out_path, self.file_path, create_backup)
+        if output_path:
+            out_path = Path(output_path)
+        elif self.file_path is not None:
+            out_path = self.file_path
+        else:
+            raise ValueError("Parser has no backing file; pass output_path to save()")
+        save_sdlxliff(self.root, out_path, self._has_bom, create_backup)
 
     def get_segment_by_id(self, segment_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -13,6 +13,7 @@ Provides stateless QA check functions that detect common translation issues:
 """
 
 import json
+import os
 import re
 import urllib.request
 import urllib.parse
@@ -20,7 +21,7 @@ import urllib.error
 from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypedDict
 
 try:
     from spellchecker import SpellChecker
@@ -31,7 +32,7 @@ except ImportError:
 from .languages import get_spellcheck_config, BACKEND_YANDEX, BACKEND_PYSPELLCHECKER
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QAIssue:
     """Represents a single QA issue found in a segment."""
     segment_id: str
@@ -42,7 +43,7 @@ class QAIssue:
     target_excerpt: str = ""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class QAReport:
     """Complete QA report for a file."""
     total_segments: int
@@ -52,14 +53,27 @@ class QAReport:
     summary: Dict[str, int] = field(default_factory=dict)
 
 
-# Trailing punctuation pattern - covers common punctuation across languages
-TRAILING_PUNCT_PATTERN = re.compile(r'[.!?:;،。！？：；]+$')
+class QASegment(TypedDict, total=False):
+    """Segment fields read by the QA checks (a subset of extract_segments() output)."""
+    segment_id: str
+    source: str
+    target: str
+    repetitions: int
+
+
+# Trailing punctuation characters - covers common punctuation across languages
+TRAILING_PUNCT = '.!?:;،。！？：；'
+TRAILING_PUNCT_CHARS = frozenset(TRAILING_PUNCT)
 
 # Number extraction pattern - matches integers and decimals with , or . separators
 NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)?')
 
-# Double space pattern
-DOUBLE_SPACE_PATTERN = re.compile(r'[ ]{2,}')
+# Word extraction pattern for spell checking (str patterns are Unicode-aware)
+WORD_PATTERN = re.compile(r'\b\w+\b')
+
+# Characters treated as edge whitespace - the same set str.strip() removes
+# (str.isspace() is true for nothing above U+3000)
+WHITESPACE_CHARS = frozenset(c for c in map(chr, range(0x3001)) if c.isspace())
 
 # Bracket characters to check
 BRACKET_PAIRS = {
@@ -71,7 +85,9 @@ BRACKET_PAIRS = {
     '「': '」',
     '『': '』',
 }
-ALL_BRACKETS = set(BRACKET_PAIRS.keys()) | set(BRACKET_PAIRS.values())
+ALL_BRACKETS = frozenset(BRACKET_PAIRS.keys()) | frozenset(BRACKET_PAIRS.values())
+BRACKET_CHARS = tuple(sorted(ALL_BRACKETS))
+ASCII_BRACKETS = tuple(b for b in BRACKET_CHARS if b.isascii())
 
 
 def check_trailing_punctuation(
@@ -89,17 +105,22 @@ def check_trailing_punctuation(
     if not source or not target:
         return None
 
-    source_punct = TRAILING_PUNCT_PATTERN.search(source)
-    target_punct = TRAILING_PUNCT_PATTERN.search(target)
+    # A single final newline is ignored, as a regex '$' anchor would
+    source_end = source[:-1] if source.endswith('\n') else source
+    target_end = target[:-1] if target.endswith('\n') else target
 
-    source_has = source_punct is not None
-    target_has = target_punct is not None
+    # Only the last character decides; the full punctuation run is
+    # extracted for the message on mismatch only
+    source_has = bool(source_end) and source_end[-1] in TRAILING_PUNCT_CHARS
+    target_has = bool(target_end) and target_end[-1] in TRAILING_PUNCT_CHARS
 
     if source_has != target_has:
         if source_has:
-            message = f"Source ends with '{source_punct.group()}' but target does not"
+            punct = source_end[len(source_end.rstrip(TRAILING_PUNCT)):]
+            message = f"Source ends with '{punct}' but target does not"
         else:
-            message = f"Target ends with '{target_punct.group()}' but source does not"
+            punct = target_end[len(target_end.rstrip(TRAILING_PUNCT)):]
+            message = f"Target ends with '{punct}' but source does not"
 
         return QAIssue(
             segment_id=segment_id,
@@ -127,31 +148,36 @@ def check_numbers(
     if not source or not target:
         return None
 
-    source_numbers = Counter(NUMBER_PATTERN.findall(source))
-    target_numbers = Counter(NUMBER_PATTERN.findall(target))
+    source_list = NUMBER_PATTERN.findall(source)
+    target_list = NUMBER_PATTERN.findall(target)
+
+    # Same numbers in the same order (including none at all) - skip the Counters
+    if source_list == target_list:
+        return None
+
+    source_numbers = Counter(source_list)
+    target_numbers = Counter(target_list)
 
     if source_numbers != target_numbers:
         parts = []
 
         # Find missing numbers (in source but not enough in target)
-        for num, count in source_numbers.items():
-            target_count = target_numbers.get(num, 0)
-            if target_count < count:
-                diff = count - target_count
-                if diff == count:
-                    parts.append(f"missing: {num}" + (f" (x{count})" if count > 1 else ""))
-                else:
-                    parts.append(f"missing: {num} (need {count}, have {target_count})")
+        for num in source_numbers - target_numbers:
+            count = source_numbers[num]
+            target_count = target_numbers[num]
+            if target_count == 0:
+                parts.append(f"missing: {num}" + (f" (x{count})" if count > 1 else ""))
+            else:
+                parts.append(f"missing: {num} (need {count}, have {target_count})")
 
         # Find extra numbers (in target but not enough in source)
-        for num, count in target_numbers.items():
-            source_count = source_numbers.get(num, 0)
-            if count > source_count:
-                diff = count - source_count
-                if source_count == 0:
-                    parts.append(f"extra: {num}" + (f" (x{count})" if count > 1 else ""))
-                else:
-                    parts.append(f"extra: {num} (have {count}, need {source_count})")
+        for num in target_numbers - source_numbers:
+            count = target_numbers[num]
+            source_count = source_numbers[num]
+            if source_count == 0:
+                parts.append(f"extra: {num}" + (f" (x{count})" if count > 1 else ""))
+            else:
+                parts.append(f"extra: {num} (have {count}, need {source_count})")
 
         return QAIssue(
             segment_id=segment_id,
@@ -178,10 +204,10 @@ def check_double_spaces(
     if not target:
         return None
 
-    match = DOUBLE_SPACE_PATTERN.search(target)
-    if match:
+    # Plain substring search stops at the first hit, no regex engine needed
+    pos = target.find('  ')
+    if pos >= 0:
         # Find position for context
-        pos = match.start()
         context_start = max(0, pos - 10)
         context_end = min(len(target), pos + 15)
         context = target[context_start:context_end]
@@ -215,10 +241,11 @@ def check_whitespace(
     source = source or ""
     target = target or ""
 
-    source_leading = source != source.lstrip()
-    source_trailing = source != source.rstrip()
-    target_leading = target != target.lstrip()
-    target_trailing = target != target.rstrip()
+    # Edge-character lookups instead of strip() copies of the whole text
+    source_leading = bool(source) and source[0] in WHITESPACE_CHARS
+    source_trailing = bool(source) and source[-1] in WHITESPACE_CHARS
+    target_leading = bool(target) and target[0] in WHITESPACE_CHARS
+    target_trailing = bool(target) and target[-1] in WHITESPACE_CHARS
 
     issues = []
 
@@ -247,6 +274,13 @@ def check_whitespace(
     return None
 
 
+def _count_brackets(text: str) -> Counter:
+    """Count bracket characters in text."""
+    # One C-level str.count per bracket; ASCII text can only hold ASCII brackets
+    brackets = ASCII_BRACKETS if text.isascii() else BRACKET_CHARS
+    return Counter({b: n for b in brackets if (n := text.count(b))})
+
+
 def check_brackets(
     segment_id: str,
     source: str,
@@ -260,25 +294,16 @@ def check_brackets(
     if not source or not target:
         return None
 
-    def count_brackets(text: str) -> Dict[str, int]:
-        counts: Dict[str, int] = {}
-        for char in text:
-            if char in ALL_BRACKETS:
-                counts[char] = counts.get(char, 0) + 1
-        return counts
-
-    source_counts = count_brackets(source)
-    target_counts = count_brackets(target)
+    source_counts = _count_brackets(source)
+    target_counts = _count_brackets(target)
 
     if source_counts != target_counts:
         mismatches = []
-        all_brackets = set(source_counts.keys()) | set(target_counts.keys())
+        # Symmetric difference of the multisets: every bracket whose count differs
+        differing = (source_counts - target_counts) | (target_counts - source_counts)
 
-        for bracket in sorted(all_brackets):
-            src = source_counts.get(bracket, 0)
-            tgt = target_counts.get(bracket, 0)
-            if src != tgt:
-                mismatches.append(f"'{bracket}': {src} vs {tgt}")
+        for bracket in sorted(differing):
+            mismatches.append(f"'{bracket}': {source_counts[bracket]} vs {target_counts[bracket]}")
 
         return QAIssue(
             segment_id=segment_id,
@@ -293,7 +318,7 @@ def check_brackets(
 
 
 def check_inconsistent_repetitions(
-    segments: List[Dict[str, Any]]
+    segments: List[QASegment]
 ) -> List[QAIssue]:
     """
     Check for segments with identical source text but different translations.
@@ -307,7 +332,7 @@ def check_inconsistent_repetitions(
     issues = []
 
     # Group segments by source text
-    source_groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    source_groups: Dict[str, List[QASegment]] = defaultdict(list)
 
     for segment in segments:
         # Only check segments that are marked as repetitions
@@ -321,39 +346,38 @@ def check_inconsistent_repetitions(
         if len(group) < 2:
             continue
 
-        # Get unique non-empty targets
-        targets: Dict[str, List[str]] = defaultdict(list)
-        for seg in group:
-            target = seg.get('target', '')
-            if target:  # Only consider non-empty targets
-                targets[target].append(seg['segment_id'])
+        # Count non-empty targets (empty targets are ignored)
+        target_counts = Counter(seg['target'] for seg in group if seg.get('target'))
 
         # If we have multiple different translations, report it
-        if len(targets) > 1:
-            # Sort targets by frequency (most common first)
-            sorted_targets = sorted(targets.items(), key=lambda x: -len(x[1]))
-
-            # The most common translation
-            most_common_target, most_common_ids = sorted_targets[0]
-
-            # Report issues for less common translations
-            for target, segment_ids in sorted_targets[1:]:
-                for seg_id in segment_ids:
-                    issues.append(QAIssue(
-                        segment_id=seg_id,
-                        check="inconsistent_repetitions",
-                        severity="warning",
-                        message=(
-                            f"Repetition has different translation than {len(most_common_ids)} "
-                            f"other segment(s) with same source"
-                        ),
-                        source_excerpt=_excerpt(source),
-                        target_excerpt=_excerpt(target),
-                    ))
+        if len(target_counts) > 1:
+            # The most common translation (first seen wins ties)
+            most_common_target, most_common_count = target_counts.most_common(1)[0]
+
+            # Report issues for segments with a less common translation
+            for seg in group:
+                target = seg.get('target', '')
+                if not target or target == most_common_target:
+                    continue
+                issues.append(QAIssue(
+                    segment_id=seg['segment_id'],
+                    check="inconsistent_repetitions",
+                    severity="warning",
+                    message=(
+                        f"Repetition has different translation than {most_common_count} "
+                        f"other segment(s) with same source"
+                    ),
+                    source_excerpt=_excerpt(source),
+                    target_excerpt=_excerpt(target),
+                ))
 
     return issues
 
 
+# Module-level cache for parsed glossaries: path -> (mtime_ns, size, terms)
+_glossaries: Dict[str, Tuple[int, int, List[Tuple[str, str]]]] = {}
+
+
 def load_glossary(glossary_path: str) -> List[Tuple[str, str]]:
     """
     Load terminology from a glossary file.
@@ -361,17 +385,32 @@ def load_glossary(glossary_path: str) -> List[Tuple[str, str]]:
     Supports tab-delimited format: source_term<TAB>target_term
     Lines starting with # are comments. Empty lines are skipped.
 
+    Parsed glossaries are cached per path and reused until the file's
+    modification time or size changes.
+
     Args:
         glossary_path: Path to the glossary file
 
     Returns:
         List of (source_term, target_term) tuples
     """
-    terms: List[Tuple[str, str]] = []
-    path = Path(glossary_path)
+    try:
+        stat = os.stat(glossary_path)
+    except OSError:
+        return []
 
-    if not path.exists():
-        return terms
+    cached = _glossaries.get(glossary_path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return list(cached[2])
+
+    terms = _parse_glossary(Path(glossary_path))
+    _glossaries[glossary_path] = (stat.st_mtime_ns, stat.st_size, terms)
+    return list(terms)
+
+
+def _parse_glossary(path: Path) -> List[Tuple[str, str]]:
+    """Parse a glossary file into (source_term, target_term) tuples."""
+    terms: List[Tuple[str, str]] = []
 
     try:
         content = path.read_text(encoding='utf-8')
@@ -401,6 +440,23 @@ def load_glossary(glossary_path: str) -> List[Tuple[str, str]]:
     return terms
 
 
+def _find_sibling_file(sdlxliff_path: str, candidates: List[str]) -> Optional[str]:
+    """
+    Return the first candidate file present next to the SDLXLIFF file.
+
+    Each candidate is probed with Path.exists(), so name matching follows
+    the filesystem's own case rules.
+    """
+    sdlxliff_dir = Path(sdlxliff_path).parent
+
+    for candidate in candidates:
+        candidate_path = sdlxliff_dir / candidate
+        if candidate_path.exists():
+            return str(candidate_path)
+
+    return None
+
+
 def discover_glossary(sdlxliff_path: str) -> Optional[str]:
     """
     Auto-discover a glossary file near the SDLXLIFF file.
@@ -417,8 +473,6 @@ def discover_glossary(sdlxliff_path: str) -> Optional[str]:
     Returns:
         Path to glossary file if found, None otherwise
     """
-    sdlxliff_dir = Path(sdlxliff_path).parent
-
     candidates = [
         'glossary.tsv',
         'glossary.txt',
@@ -426,12 +480,7 @@ def discover_glossary(sdlxliff_path: str) -> Optional[str]:
         'terminology.txt',
     ]
 
-    for candidate in candidates:
-        glossary_path = sdlxliff_dir / candidate
-        if glossary_path.exists():
-            return str(glossary_path)
-
-    return None
+    return _find_sibling_file(sdlxliff_path, candidates)
 
 
 def check_terminology(
@@ -558,20 +607,13 @@ def discover_custom_dictionary(sdlxliff_path: str) -> Optional[str]:
     Returns:
         Path to dictionary file if found, None otherwise
     """
-    sdlxliff_dir = Path(sdlxliff_path).parent
-
     candidates = [
         'dictionary.txt',
         'custom_words.txt',
         'spelling.txt',
     ]
 
-    for candidate in candidates:
-        dict_path = sdlxliff_dir / candidate
-        if dict_path.exists():
-            return str(dict_path)
-
-    return None
+    return _find_sibling_file(sdlxliff_path, candidates)
 
 
 def _check_spelling_yandex(
@@ -707,7 +749,7 @@ def _check_spelling_pyspellchecker(
         return issues
 
     # Extract words (Unicode-aware, skip single chars and pure numbers)
-    words = re.findall(r'\b\w+\b', target, re.UNICODE)
+    words = WORD_PATTERN.findall(target)
     words = [w for w in words if len(w) > 1 and not w.isdigit()]
 
     # Find misspelled words
@@ -771,8 +813,102 @@ def check_spelling(
         return []
 
 
+def _check_double_spaces_pair(
+    segment_id: str,
+    source: str,
+    target: str
+) -> Optional[QAIssue]:
+    """Adapt check_double_spaces to the (segment_id, source, target) signature."""
+    return check_double_spaces(segment_id, target)
+
+
+# Per-segment checks sharing the (segment_id, source, target) signature,
+# in the order their issues are reported
+_SEGMENT_CHECKS: Dict[str, Callable[[str, str, str], Optional[QAIssue]]] = {
+    'trailing_punctuation': check_trailing_punctuation,
+    'numbers': check_numbers,
+    'double_spaces': _check_double_spaces_pair,
+    'whitespace': check_whitespace,
+    'brackets': check_brackets,
+}
+
+# Default checks (spelling is OPT-IN, not included here)
+DEFAULT_CHECKS = frozenset({
+    'trailing_punctuation',
+    'numbers',
+    'double_spaces',
+    'whitespace',
+    'brackets',
+    'inconsistent_repetitions',
+    'terminology',
+})
+
+# All available checks (includes opt-in checks)
+ALL_CHECKS = DEFAULT_CHECKS | {'spelling'}
+
+
+def _join_sources(segments: List[QASegment]) -> str:
+    """Join all source texts into one newline-separated corpus buffer."""
+    return '\n'.join(seg.get('source') or '' for seg in segments)
+
+
+def _drop_absent_checks(
+    check_names: Set[str],
+    segments: List[QASegment],
+    sources: Optional[str] = None
+) -> Set[str]:
+    """
+    Drop per-segment checks that cannot fire anywhere in the corpus.
+
+    Joins each side once and runs one C-level scan per check over the
+    joined buffer, instead of calling the check for every segment. Only
+    checks with a content trigger are pruned: double spaces in targets,
+    brackets and numbers in either side. Sources are joined only when the
+    targets alone do not already keep those checks, unless the caller
+    passes an already joined sources buffer.
+    """
+    if check_names.isdisjoint(('double_spaces', 'brackets', 'numbers')):
+        return check_names
+
+    remaining = set(check_names)
+    targets = '\n'.join(seg.get('target') or '' for seg in segments)
+
+    if 'double_spaces' in remaining and '  ' not in targets:
+        remaining.discard('double_spaces')
+
+    either_side = remaining & {'brackets', 'numbers'}
+    if 'brackets' in either_side and not ALL_BRACKETS.isdisjoint(targets):
+        either_side.discard('brackets')
+    if 'numbers' in either_side and NUMBER_PATTERN.search(targets) is not None:
+        either_side.discard('numbers')
+
+    if either_side:
+        if sources is None:
+            sources = _join_sources(segments)
+        if 'brackets' in either_side and ALL_BRACKETS.isdisjoint(sources):
+            remaining.discard('brackets')
+        if 'numbers' in either_side and NUMBER_PATTERN.search(sources) is None:
+            remaining.discard('numbers')
+
+    return remaining
+
+
+def _terms_in_corpus(
+    terms: List[Tuple[str, str]],
+    sources: str
+) -> List[Tuple[str, str]]:
+    """
+    Keep only glossary terms whose source term occurs somewhere in the corpus.
+
+    One C-level substring search per term over the joined sources replaces
+    a Python-level loop over the whole glossary for every segment. Glossary
+    order is preserved so issues are reported in the same order.
+    """
+    return [term for term in terms if term[0] in sources]
+
+
 def run_qa_checks(
-    segments: List[Dict[str, Any]],
+    segments: List[QASegment],
     checks: Optional[List[str]] = None,
     glossary_terms: Optional[List[Tuple[str, str]]] = None,
     target_lang: Optional[str] = None,
@@ -799,72 +935,64 @@ def run_qa_checks(
     Returns:
         QAReport with all issues found
     """
-    # Default checks (spelling is OPT-IN, not included here)
-    default_checks = {
-        'trailing_punctuation',
-        'numbers',
-        'double_spaces',
-        'whitespace',
-        'brackets',
-        'inconsistent_repetitions',
-        'terminology',
-    }
-
-    # All available checks (includes opt-in checks)
-    all_checks = default_checks | {'spelling'}
-
     if checks is None:
-        enabled_checks = default_checks  # Use defaults (no spelling)
+        enabled_checks = DEFAULT_CHECKS  # Use defaults (no spelling)
     else:
-        enabled_checks = set(checks) & all_checks  # Use specified checks
+        enabled_checks = ALL_CHECKS.intersection(checks)  # Unknown names are dropped
+
+    # Nothing to do: skip the corpus scan and segment loop entirely
+    if not segments or not enabled_checks:
+        return QAReport(
+            total_segments=len(segments),
+            segments_checked=0,
+            segments_with_issues=0,
+        )
 
     issues: List[QAIssue] = []
     segments_with_issues: Set[str] = set()
 
-    # Per-segment checks
-    for segment in segments:
-        segment_id = segment.get('segment_id', '')
-        source = segment.get('source', '')
-        target = segment.get('target', '')
-
-        segment_issues: List[QAIssue] = []
-
-        if 'trailing_punctuation' in enabled_checks:
-            issue = check_trailing_punctuation(segment_id, source, target)
-            if issue:
-                segment_issues.append(issue)
-
-        if 'numbers' in enabled_checks:
-            issue = check_numbers(segment_id, source, target)
-            if issue:
-                segment_issues.append(issue)
+    # Resolve enabled checks once instead of testing every name per segment
+    # Sources are joined once and shared by the corpus-level prefilters
+    sources = None
+    if 'terminology' in enabled_checks and glossary_terms:
+        sources = _join_sources(segments)
+        glossary_terms = _terms_in_corpus(glossary_terms, sources)
+
+    segment_check_names = enabled_checks & _SEGMENT_CHECKS.keys()
+    if segment_check_names:
+        segment_check_names = _drop_absent_checks(segment_check_names, segments, sources)
+    segment_checks = [
+        check_fn for name, check_fn in _SEGMENT_CHECKS.items()
+        if name in segment_check_names
+    ]
+    run_terminology = 'terminology' in enabled_checks and bool(glossary_terms)
+    run_spelling = 'spelling' in enabled_checks and bool(target_lang)
 
-        if 'double_spaces' in enabled_checks:
-            issue = check_double_spaces(segment_id, target)
-            if issue:
-                segment_issues.append(issue)
+    # Per-segment checks (skipped when only cross-segment checks are enabled)
+    if segment_checks or run_terminology or run_spelling:
+        for segment in segments:
+            segment_id = segment.get('segment_id', '')
+            source = segment.get('source', '')
+            target = segment.get('target', '')
 
-        if 'whitespace' in enabled_checks:
-            issue = check_whitespace(segment_id, source, target)
-            if issue:
-                segment_issues.append(issue)
+            segment_issues: List[QAIssue] = []
 
-        if 'brackets' in enabled_checks:
-            issue = check_brackets(segment_id, source, target)
-            if issue:
-                segment_issues.append(issue)
+            for check_fn in segment_checks:
+                issue = check_fn(segment_id, source, target)
+                if issue:
+                    segment_issues.append(issue)
 
-        if 'terminology' in enabled_checks and glossary_terms:
-            term_issues = check_terminology(segment_id, source, target, glossary_terms)
-            segment_issues.extend(term_issues)
+            if run_terminology:
+                term_issues = check_terminology(segment_id, source, target, glossary_terms)
+                segment_issues.extend(term_issues)
 
-        if 'spelling' in enabled_checks and target_lang:
-            spelling_issues = check_spelling(segment_id, target, target_lang, custom_words)
-            segment_issues.extend(spelling_issues)
+            if run_spelling:
+                spelling_issues = check_spelling(segment_id, target, target_lang, custom_words)
+                segment_issues.extend(spelling_issues)
 
-        if segment_issues:
-            segments_with_issues.add(segment_id)
-            issues.extend(segment_issues)
+            if segment_issues:
+                segments_with_issues.add(segment_id)
+                issues.extend(segment_issues)
 
     # Cross-segment checks
     if 'inconsistent_repetitions' in enabled_checks:
@@ -873,17 +1001,12 @@ def run_qa_checks(
             segments_with_issues.add(issue.segment_id)
         issues.extend(rep_issues)
 
-    # Build summary
-    summary: Dict[str, int] = defaultdict(int)
-    for issue in issues:
-        summary[issue.check] += 1
-
     return QAReport(
         total_segments=len(segments),
         segments_checked=len(segments),
         segments_with_issues=len(segments_with_issues),
         issues=issues,
-        summary=dict(summary),
+        summary=dict(Counter(issue.check for issue in issues)),
     )
 
 
@@ -73,6 +73,18 @@ logger.info(f"Platform: {sys.platform}")
 app = Server("sdlxliff-server")
 
 
+def _dumps(obj: Any, pretty: bool = False) -> str:
+    """
+    Serialize a tool response to JSON.
+
+    Compact output is the default: responses are consumed by LLM agents, and
+    indentation only adds whitespace tokens and bytes on the stdio pipe.
+    """
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+
+
 @app.list_resources()
 async def list_resources() -> list[Resource]:
     """
@@ -175,6 +187,14 @@ async def list_tools() -> list[Tool]:
                         ),
                         "default": False,
                     },
+                    "pretty": {
+                        "type": "boolean",
+                        "description": (
+                            "If true, indents the JSON response for human reading. "
+                            "Default: false (compact output, fewer tokens)."
+                        ),
+                        "default": False,
+                    },
                 },
                 "required": ["file_path"],
             },
@@ -282,6 +302,14 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "Path to the SDLXLIFF file (can be relative or absolute)",
                     },
+                    "pretty": {
+                        "type": "boolean",
+                        "description": (
+                            "If true, indents the JSON response for human reading. "
+                            "Default: false (compact output, fewer tokens)."
+                        ),
+                        "default": False,
+                    },
                 },
                 "required": ["file_path"],
             },
@@ -432,6 +460,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             max_percent = arguments.get("max_percent")  # None means no filtering
             skip_cm = arguments.get("skip_cm", False)  # Skip Context Matches
             for_indexing = arguments.get("for_indexing", False)  # Bypass limit for RAG indexing
+            pretty = arguments.get("pretty", False)
             logger.info(f"read_sdlxliff: file_path={file_path}, include_tags={include_tags}, offset={offset}, limit={limit}, max_percent={max_percent}, skip_cm={skip_cm}, for_indexing={for_indexing}")
             logger.info(f"CWD: {os.getcwd()}")
 
@@ -494,7 +523,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
             return [
                 TextContent(
                     type="text",
-                    text=json.dumps(response, indent=2, ensure_ascii=False),
+                    text=_dumps(response, pretty),
                 )
             ]
 
@@ -587,13 +616,14 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         elif name == "get_sdlxliff_statistics":
             file_path = arguments["file_path"]
+            pretty = arguments.get("pretty", False)
             parser = get_parser(file_path)
             stats = parser.get_statistics()
 
             return [
                 TextContent(
                     type="text",
-                    text=json.dumps(stats, indent=2, ensure_ascii=False),
+                    text=_dumps(stats, pretty),
                 )
             ]
 
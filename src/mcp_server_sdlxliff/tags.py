@@ -17,6 +17,9 @@ from lxml import etree
 
 from .constants import INLINE_TAG_NAMES, SELF_CLOSING_TAG_NAMES
 
+# Pattern matches: {id}, {/id}, {x:id}, or plain text
+TAGGED_TEXT_PATTERN = re.compile(r'\{(/?\d+|x:\d+)\}|([^{}]+)')
+
 
 def extract_content_with_tags(mrk: etree._Element) -> Dict[str, Any]:
     """
@@ -46,6 +49,13 @@ def extract_content_with_tags(mrk: etree._Element) -> Dict[str, Any]:
 
         # Process children
         for child in elem:
+            # The secure parser keeps entity references unexpanded; refuse
+            # them rather than emit text that never reached the document
+            if isinstance(child, etree._Entity):
+                raise ValueError(
+                    f"Unexpanded entity reference {child.text} in segment content"
+                )
+
             # Skip x-sdl-location markers (they don't contain translatable text)
             if child.get('mtype') == 'x-sdl-location':
                 if child.tail:
@@ -111,10 +121,8 @@ def parse_tagged_text(tagged_text: str) -> List[Dict[str, Any]]:
         - tag_id: The tag ID (for tag types)
     """
     result = []
-    # Pattern matches: {id}, {/id}, {x:id}, or plain text
-    pattern = r'\{(/?\d+|x:\d+)\}|([^{}]+)'
 
-    for match in re.finditer(pattern, tagged_text):
+    for match in TAGGED_TEXT_PATTERN.finditer(tagged_text):
         tag_match, text_match = match.groups()
 
         if text_match:
